@@ -5,6 +5,7 @@ import codecs
 import contextlib
 import datetime
 import email.utils
+import functools
 import ipaddress
 import json
 import logging
@@ -443,31 +444,22 @@ def is_proxy_disabled(host, no_proxy_env):
     if no_proxy_env == "*":
         return True
 
-    def patterns(network_type=None):
-        for pattern in no_proxy_env.split(","):
-            pattern = pattern.strip()
-            if pattern:
-                if network_type is not None:
-                    try:
-                        pattern = network_type(pattern, strict=False)
-                    except ValueError:
-                        continue
-                yield pattern
+    hostnames, suffixes, ipv4_networks, ipv6_networks = _parse_no_proxy(no_proxy_env)
 
     is_disabled = False
 
     if host[0] == "[":
         # match IPv6
-        return _is_proxy_disabled_ipv6(host, patterns(ipaddress.IPv6Network))
+        return _is_proxy_disabled_ipv6(host, ipv6_networks)
     else:
         try:
             addr = ipaddress.IPv4Address(host)
         except ValueError:
             # neither IPv4 nor IPv6 address, match hostname
-            is_disabled = _is_proxy_disabled_host(host, patterns())
+            is_disabled = _is_proxy_disabled_host(host, hostnames, suffixes)
         else:
             # match IPv4
-            for net in patterns(ipaddress.IPv4Network):
+            for net in ipv4_networks:
                 if addr in net:
                     is_disabled = True
                     break
@@ -475,6 +467,46 @@ def is_proxy_disabled(host, no_proxy_env):
     return is_disabled
 
 
+@functools.lru_cache(maxsize=32)
+def _parse_no_proxy(no_proxy_env):
+    # the same environment value is checked for every request, so parse it
+    # only once
+    hostnames = []
+    ipv4_networks = []
+    ipv6_networks = []
+
+    for pattern in no_proxy_env.split(","):
+        pattern = pattern.strip()
+        if not pattern:
+            continue
+
+        for network_type, networks in (
+            (ipaddress.IPv4Network, ipv4_networks),
+            (ipaddress.IPv6Network, ipv6_networks),
+        ):
+            with contextlib.suppress(ValueError):
+                networks.append(network_type(pattern, strict=False))
+
+        # ignore case
+        hostname = pattern.lower()
+
+        # ignore trailing dots in the pattern to check
+        if hostname[-1] == ".":
+            hostname = hostname[:-1]
+
+        if hostname and hostname[0] == ".":
+            # ignore leading pattern dot as well
+            hostname = hostname[1:]
+
+        if hostname:
+            hostnames.append(hostname)
+
+    # note: the leading dot makes sure nonexample.com doesn't match example.com
+    suffixes = tuple(f".{hostname}" for hostname in hostnames)
+
+    return frozenset(hostnames), suffixes, tuple(ipv4_networks), tuple(ipv6_networks)
+
+
 def _is_proxy_disabled_ipv6(host, disabled_networks):
     end = host.find("]")
     if end > 0:
@@ -489,7 +521,7 @@ def _is_proxy_disabled_ipv6(host, disabled_networks):
     return False
 
 
-def _is_proxy_disabled_host(host, patterns):
+def _is_proxy_disabled_host(host, hostnames, suffixes):
     # ignore trailing dots in the host name
     if host[-1] == ".":
         host = host[:-1]
@@ -497,28 +529,9 @@ def _is_proxy_disabled_host(host, patterns):
     # ignore case
     host = host.lower()
 
-    for pattern in patterns:
-        # ignore trailing dots in the pattern to check
-        if pattern[-1] == ".":
-            pattern = pattern[:-1]
-
-        if pattern and pattern[0] == ".":
-            # ignore leading pattern dot as well
-            pattern = pattern[1:]
-
-        if not pattern:
-            continue
-
-        # exact match: example.com matches 'example.com'
-        if host == pattern.lower():
-            return True
-
-        # tail match: www.example.com matches 'example.com'
-        # note: nonexample.com does not match 'example.com'
-        if host.endswith(f".{pattern}"):
-            return True
-
-    return False
+    # exact match: example.com matches 'example.com'
+    # tail match: www.example.com matches 'example.com'
+    return host in hostnames or host.endswith(suffixes)
 
 
 def _parse_dict_header(value):
@@ -26,6 +26,12 @@ logger = logging.getLogger(__name__)
 client_ip_var = contextvars.ContextVar("client_ip")
 connection_id_var = contextvars.ContextVar("connection_id")
 authenticator_var = contextvars.ContextVar("authenticator")
+LOG_LEVEL_MAP = {
+    "debug": logging.DEBUG,
+    "info": logging.INFO,
+    "warning": logging.WARNING,
+    "error": logging.ERROR,
+}
 
 
 def run_hub():
@@ -142,6 +148,7 @@ def require_role(role):
 class Hub:
     def __init__(self, config=None, http_client=None):
         self._places = {}
+        self._places_response = None
         self._exporters = {}
         self._available = set()
         self._wait_queue = []
@@ -152,14 +159,7 @@ class Hub:
             config = {}
 
         if "log_level" in config:
-            log_level_str = config["log_level"]
-            log_level_map = {
-                "debug": logging.DEBUG,
-                "info": logging.INFO,
-                "warning": logging.WARNING,
-                "error": logging.ERROR,
-            }
-            log_level = log_level_map[log_level_str]
+            log_level = LOG_LEVEL_MAP[config["log_level"]]
 
             logging.basicConfig(
                 format="%(levelname)s: %(name)s: %(message)s", level=log_level
@@ -204,7 +204,11 @@ class Hub:
 
     @jsonrpc.hidden
     async def get_places(self):
-        return {"places": [p.dict() for p in self._places.values()]}
+        # places only change on (de)registration, reuse the response until then
+        if self._places_response is None:
+            places = [p.dict() for p in self._places.values()]
+            self._places_response = {"places": places}
+        return self._places_response
 
     @jsonrpc.hidden
     async def communicate(self, client_ip, channel):
@@ -228,6 +232,7 @@ class Hub:
             if id_ in self._places:
                 logger.info("Place disappeared: %d", id_)
                 del self._places[id_]
+                self._places_response = None
                 del self._exporters[id_]
                 self._available.discard(id_)
                 for candidates, _, future in self._wait_queue:
@@ -254,6 +259,7 @@ class Hub:
             raise RuntimeError("Place already registered")
 
         self._places[id_] = place
+        self._places_response = None
         self._exporters[id_] = jsonrpc.get_current_channel()
         self._available.add(id_)
         logger.info("New place registered: %d", id_)
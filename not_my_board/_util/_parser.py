@@ -8,20 +8,20 @@ TIME_UNIT_TO_SECONDS = {
     "weeks": 7 * 24 * 60 * 60,
 }
 
+TIME_PATTERN = re.compile(
+    r"(?:(?P<weeks>\d+)w)?"
+    r"(?:(?P<days>\d+)d)?"
+    r"(?:(?P<hours>\d+)h)?"
+    r"(?:(?P<minutes>\d+)m)?"
+    r"(?:(?P<seconds>\d+)s?)?"
+)
+
 
 def parse_time(time_string):
     if not time_string:
         raise RuntimeError("Time is an empty string")
 
-    time_pattern = (
-        r"(?:(?P<weeks>\d+)w)?"
-        r"(?:(?P<days>\d+)d)?"
-        r"(?:(?P<hours>\d+)h)?"
-        r"(?:(?P<minutes>\d+)m)?"
-        r"(?:(?P<seconds>\d+)s?)?"
-    )
-
-    match = re.fullmatch(time_pattern, time_string)
+    match = TIME_PATTERN.fullmatch(time_string)
     if match is None:
         raise RuntimeError("Invalid time format")
 
@@ -23,6 +23,9 @@ except ModuleNotFoundError:
 
 
 TOKEN_STORE_PATH = "/var/lib/not-my-board/auth_tokens.json"  # noqa: S105
+LOG_FORMAT = "%(asctime)s %(levelname)s: %(name)s: %(message)s"
+# loggers, that are too noisy on debug level
+VERBOSE_LOGGERS = ("websockets.client", "asyncio")
 
 
 # ruff: noqa: PLR0915
@@ -140,22 +143,18 @@ def main():
 
     # Don't use escape sequences, if stdout is not a tty
     if not sys.stdout.isatty():
-        for attr in dir(Format):
-            if not attr.startswith("_"):
-                setattr(Format, attr, "")
+        Format.disable()
 
     if args.verbose:
         level = logging.DEBUG
 
         # reduce level of verbose loggers
-        logging.getLogger("websockets.client").setLevel(logging.INFO)
-        logging.getLogger("asyncio").setLevel(logging.INFO)
+        for name in VERBOSE_LOGGERS:
+            logging.getLogger(name).setLevel(logging.INFO)
     else:
         level = logging.WARNING
 
-    logging.basicConfig(
-        format="%(asctime)s %(levelname)s: %(name)s: %(message)s", level=level
-    )
+    logging.basicConfig(format=LOG_FORMAT, level=level)
 
     try:
         obj = args.func(args)
@@ -295,3 +294,9 @@ class Format:
     RED = "\033[31m"
     GREEN = "\033[32m"
     YELLOW = "\033[33m"
+
+    @classmethod
+    def disable(cls):
+        for attr, value in list(vars(cls).items()):
+            if attr.isupper() and isinstance(value, str):
+                setattr(cls, attr, "")
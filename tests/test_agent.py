@@ -8,38 +8,20 @@ import not_my_board._models as models
 import not_my_board._util as util
 
 HUB_URL = "http://fake.farm"
-PLACE_1 = models.Place(
-    id=1289,
-    host="3.1.1.1",
-    port=2000,
-    parts=[
-        models.ExportedPart(
-            compatible=["fake-board"],
-            usb={
-                "usb0": models.UsbExportDesc(usbid="1-3"),
-            },
-            tcp={
-                "ssh": models.TcpExportDesc(host="10.0.0.5", port=22),
-            },
-        )
-    ],
+FAKE_BOARD_PART = models.ExportedPart(
+    compatible=["fake-board"],
+    usb={
+        "usb0": models.UsbExportDesc(usbid="1-3"),
+    },
+    tcp={
+        "ssh": models.TcpExportDesc(host="10.0.0.5", port=22),
+    },
 )
 
+PLACE_1 = models.Place(id=1289, host="3.1.1.1", port=2000, parts=[FAKE_BOARD_PART])
+
 PLACE_LOCALHOST = models.Place(
-    id=338,
-    host="127.0.0.1",
-    port=2000,
-    parts=[
-        models.ExportedPart(
-            compatible=["fake-board"],
-            usb={
-                "usb0": models.UsbExportDesc(usbid="1-3"),
-            },
-            tcp={
-                "ssh": models.TcpExportDesc(host="10.0.0.5", port=22),
-            },
-        )
-    ],
+    id=338, host="127.0.0.1", port=2000, parts=[FAKE_BOARD_PART]
 )
 
 PLACE_COMPLEX = models.Place(
@@ -47,15 +29,7 @@ PLACE_COMPLEX = models.Place(
     host="3.1.1.1",
     port=2001,
     parts=[
-        models.ExportedPart(
-            compatible=["fake-board"],
-            usb={
-                "usb0": models.UsbExportDesc(usbid="1-3"),
-            },
-            tcp={
-                "ssh": models.TcpExportDesc(host="10.0.0.5", port=22),
-            },
-        ),
+        FAKE_BOARD_PART,
         models.ExportedPart(
             compatible=["fake-board"],
             tcp={
@@ -106,15 +80,21 @@ class FakeHub:
         self.reserve_pending = asyncio.Event()
         self.reserve_continue.set()
 
+    def reset(self):
+        self.reserve_request = None
+        self.reserved.clear()
+        self.reserve_continue.set()
+
     def set_api_object(self, _):
         pass
 
     async def reserve(self, candidate_ids):
-        self.reserve_pending.set()
-        try:
-            await self.reserve_continue.wait()
-        finally:
-            self.reserve_pending.clear()
+        if not self.reserve_continue.is_set():
+            self.reserve_pending.set()
+            try:
+                await self.reserve_continue.wait()
+            finally:
+                self.reserve_pending.clear()
 
         self.reserve_request = candidate_ids
         self.reserved.add(candidate_ids[0])
@@ -136,6 +116,10 @@ class FakeAgentIO:
         self.detach_event = {}
         self.port_forwards = {}
 
+    def reset(self):
+        self.places = []
+        self.hub.reset()
+
     @contextlib.asynccontextmanager
     async def hub_rpc(self):
         self.hub = FakeHub()
@@ -186,14 +170,39 @@ class FakeAgentIO:
             del self.port_forwards[local_port]
 
 
-@pytest.fixture
-async def agent_io():
+@pytest.fixture(scope="module")
+async def shared_agent_io():
     io = FakeAgentIO()
     async with agentmodule.Agent(HUB_URL, io, None) as agent:
         async with util.background_task(agent.serve_forever()):
             yield io
 
 
+@pytest.fixture
+async def agent_io(shared_agent_io):
+    yield shared_agent_io
+
+    # The agent is shared by all tests in this module. Return everything the
+    # test left behind, so the next test starts with an idle agent.
+    shared_agent_io.hub.reserve_continue.set()
+    agent_api = shared_agent_io.agent_api
+    for entry in await agent_api.list():
+        await agent_api.return_reservation(entry["place"], force=True)
+    shared_agent_io.reset()
+
+
+@pytest.fixture
+async def reserved(agent_io):
+    agent_io.places = [PLACE_1]
+    await agent_io.agent_api.reserve("fake", IMPORT_DESC_1)
+    return agent_io
+
+
+@pytest.fixture
+async def attached(reserved):
+    await reserved.agent_api.attach("fake")
+
+
 async def test_idle_list(agent_io):
     list_ = await agent_io.agent_api.list()
     assert list_ == []
@@ -222,30 +231,25 @@ async def test_attach(agent_io):
     usbid = PLACE_1.parts[0].usb["usb0"].usbid
     assert agent_io.attached == {port_num: (proxy, usbip_target, usbid)}
     local_port = 2222
-    tcp_target = tuple(
-        getattr(PLACE_1.parts[0].tcp["ssh"], k) for k in ("host", "port")
-    )
+    ssh = PLACE_1.parts[0].tcp["ssh"]
+    tcp_target = (ssh.host, ssh.port)
     assert agent_io.port_forwards == {local_port: (proxy, tcp_target)}
 
 
+@pytest.mark.usefixtures("reserved")
 async def test_list_place_1(agent_io):
-    agent_io.places = [PLACE_1]
-    await agent_io.agent_api.reserve("fake", IMPORT_DESC_1)
     list_ = await agent_io.agent_api.list()
     assert list_ == [{"place": "fake", "attached": False}]
 
 
+@pytest.mark.usefixtures("attached")
 async def test_list_place_1_attached(agent_io):
-    agent_io.places = [PLACE_1]
-    await agent_io.agent_api.reserve("fake", IMPORT_DESC_1)
-    await agent_io.agent_api.attach("fake")
     list_ = await agent_io.agent_api.list()
     assert list_ == [{"place": "fake", "attached": True}]
 
 
+@pytest.mark.usefixtures("reserved")
 async def test_status_place_1(agent_io):
-    agent_io.places = [PLACE_1]
-    await agent_io.agent_api.reserve("fake", IMPORT_DESC_1)
     status = await agent_io.agent_api.status()
     assert len(status) == 2
     usb0_status = {
@@ -268,10 +272,8 @@ async def test_status_place_1(agent_io):
     assert ssh_status in status
 
 
+@pytest.mark.usefixtures("attached")
 async def test_status_place_1_attached(agent_io):
-    agent_io.places = [PLACE_1]
-    await agent_io.agent_api.reserve("fake", IMPORT_DESC_1)
-    await agent_io.agent_api.attach("fake")
     status = await agent_io.agent_api.status()
     assert len(status) == 2
     assert status[0]["attached"] is True
@@ -279,25 +281,21 @@ async def test_status_place_1_attached(agent_io):
     assert "2-1" in [s["port"] for s in status]
 
 
+@pytest.mark.usefixtures("reserved")
 async def test_reserve_twice(agent_io):
-    agent_io.places = [PLACE_1]
-    await agent_io.agent_api.reserve("fake", IMPORT_DESC_1)
     with pytest.raises(RuntimeError) as execinfo:
         await agent_io.agent_api.reserve("fake", IMPORT_DESC_1)
     assert "is already reserved" in str(execinfo.value)
 
 
+@pytest.mark.usefixtures("reserved")
 async def test_return_reservation(agent_io):
-    agent_io.places = [PLACE_1]
-    await agent_io.agent_api.reserve("fake", IMPORT_DESC_1)
     await agent_io.agent_api.return_reservation("fake")
     assert not agent_io.hub.reserved
 
 
+@pytest.mark.usefixtures("attached")
 async def test_detach(agent_io):
-    agent_io.places = [PLACE_1]
-    await agent_io.agent_api.reserve("fake", IMPORT_DESC_1)
-    await agent_io.agent_api.attach("fake")
     await agent_io.agent_api.detach("fake")
     assert not agent_io.attached
     assert not agent_io.port_forwards
@@ -308,19 +306,15 @@ async def test_detach(agent_io):
     assert not status[1]["attached"]
 
 
+@pytest.mark.usefixtures("attached")
 async def test_return_reservation_while_attached(agent_io):
-    agent_io.places = [PLACE_1]
-    await agent_io.agent_api.reserve("fake", IMPORT_DESC_1)
-    await agent_io.agent_api.attach("fake")
     with pytest.raises(RuntimeError) as execinfo:
         await agent_io.agent_api.return_reservation("fake")
     assert "is still attached" in str(execinfo.value)
 
 
+@pytest.mark.usefixtures("attached")
 async def test_force_return_reservation(agent_io):
-    agent_io.places = [PLACE_1]
-    await agent_io.agent_api.reserve("fake", IMPORT_DESC_1)
-    await agent_io.agent_api.attach("fake")
     await agent_io.agent_api.return_reservation(name="fake", force=True)
     assert not agent_io.attached
     assert not agent_io.port_forwards
@@ -352,19 +346,15 @@ async def test_localhost_exporter(agent_io):
     assert agent_io.attached[port_num][0] == proxy
 
 
+@pytest.mark.usefixtures("attached")
 async def test_attach_twice(agent_io):
-    agent_io.places = [PLACE_1]
-    await agent_io.agent_api.reserve("fake", IMPORT_DESC_1)
-    await agent_io.agent_api.attach("fake")
     with pytest.raises(RuntimeError) as execinfo:
         await agent_io.agent_api.attach("fake")
     assert "is already attached" in str(execinfo.value)
 
 
+@pytest.mark.usefixtures("attached")
 async def test_detach_twice(agent_io):
-    agent_io.places = [PLACE_1]
-    await agent_io.agent_api.reserve("fake", IMPORT_DESC_1)
-    await agent_io.agent_api.attach("fake")
     await agent_io.agent_api.detach("fake")
     with pytest.raises(RuntimeError) as execinfo:
         await agent_io.agent_api.detach("fake")
@@ -407,7 +397,7 @@ async def test_reserve_twice_concurrently(agent_io):
                 # unblock reserve call
                 agent_io.hub.reserve_continue.set()
 
-                await asyncio.sleep(0.5)
+                await asyncio.wait([task_1, task_2])
 
     # now one should finish successfully and the other one should fail
     results = await asyncio.gather(task_1, task_2, return_exceptions=True)
@@ -418,16 +408,14 @@ async def test_reserve_twice_concurrently(agent_io):
     assert len(await agent_io.agent_api.list()) == 1
 
 
+@pytest.mark.usefixtures("reserved")
 async def test_get_import_description(agent_io):
-    agent_io.places = [PLACE_1]
-    await agent_io.agent_api.reserve("fake", IMPORT_DESC_1)
     import_description_toml = await agent_io.agent_api.get_import_description("fake")
     assert import_description_toml == IMPORT_DESC_1
 
 
+@pytest.mark.usefixtures("reserved")
 async def test_update_import_description(agent_io):
-    agent_io.places = [PLACE_1]
-    await agent_io.agent_api.reserve("fake", IMPORT_DESC_1)
     new_import_description = """
         [parts.fake-board]
         compatible = [ "fake-board" ]
@@ -440,10 +428,8 @@ async def test_update_import_description(agent_io):
     assert agent_io.attached[7][2] == usbid
 
 
+@pytest.mark.usefixtures("attached")
 async def test_update_import_description_attached(agent_io):
-    agent_io.places = [PLACE_1]
-    await agent_io.agent_api.reserve("fake", IMPORT_DESC_1)
-    await agent_io.agent_api.attach("fake")
     new_import_description = """
         [parts.fake-board]
         compatible = [ "fake-board" ]
@@ -455,10 +441,8 @@ async def test_update_import_description_attached(agent_io):
     assert agent_io.attached[7][2] == usbid
 
 
+@pytest.mark.usefixtures("attached")
 async def test_update_import_description_not_matching(agent_io):
-    agent_io.places = [PLACE_1]
-    await agent_io.agent_api.reserve("fake", IMPORT_DESC_1)
-    await agent_io.agent_api.attach("fake")
     new_import_description = """
         [parts.fake-board]
         compatible = [ "does-not-match" ]
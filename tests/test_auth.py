@@ -2,7 +2,10 @@ import asyncio
 import base64
 import contextlib
 import datetime
+import functools
 import hashlib
+import heapq
+import itertools
 import json
 import pathlib
 import secrets
@@ -27,12 +30,27 @@ USER_NAME = "test-user"
 real_sleep = asyncio.sleep
 
 
+@functools.lru_cache(maxsize=None)
+def private_key():
+    # key generation is slow, share one key between all fake clients
+    return rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+
 class FakeHttpClient:
     def __init__(self):
-        self._private_key = rsa.generate_private_key(
-            public_exponent=65537, key_size=2048
-        )
+        self._private_key = private_key()
         self._key_id = secrets.token_urlsafe()
+        self._oidc_config = {
+            "issuer": ISSUER_URL,
+            "authorization_endpoint": f"{ISSUER_URL}/authorize",
+            "token_endpoint": f"{ISSUER_URL}/token",
+            "jwks_uri": f"{ISSUER_URL}/jwks",
+        }
+        alg = jwt.get_algorithm_by_name("RS256")
+        jwk = alg.to_jwk(self._private_key.public_key(), as_dict=True)
+        jwk["use"] = "sig"
+        jwk["kid"] = self._key_id
+        self._jwks = {"keys": [jwk]}
         self._refresh_token = None
         self._nonce = None
         self._sub = USER_NAME
@@ -47,18 +65,9 @@ class FakeHttpClient:
         if url == f"{HUB_URL}/api/v1/auth-info":
             response = self._hub.auth_info()
         elif url == f"{ISSUER_URL}/.well-known/openid-configuration":
-            response = {
-                "issuer": ISSUER_URL,
-                "authorization_endpoint": f"{ISSUER_URL}/authorize",
-                "token_endpoint": f"{ISSUER_URL}/token",
-                "jwks_uri": f"{ISSUER_URL}/jwks",
-            }
+            response = self._oidc_config
         elif url == f"{ISSUER_URL}/jwks":
-            alg = jwt.get_algorithm_by_name("RS256")
-            jwk = alg.to_jwk(self._private_key.public_key(), as_dict=True)
-            jwk["use"] = "sig"
-            jwk["kid"] = self._key_id
-            response = {"keys": [jwk]}
+            response = self._jwks
         else:
             raise RuntimeError(f"URL not found: {url}")
 
@@ -141,9 +150,7 @@ class FakeHttpClient:
 
             async def receive_iter(queue):
                 while True:
-                    data = await queue.get()
-                    yield data
-                    queue.task_done()
+                    yield await queue.get()
 
             channel = jsonrpc.Channel(hub_to_client.put, receive_iter(client_to_hub))
             coro = self._hub.communicate("", channel)
@@ -365,7 +372,8 @@ def fake_time(monkeypatch):
 class FakeTime:
     def __init__(self):
         self._now = 0
-        self._waiters = set()
+        self._waiters = []
+        self._counter = itertools.count()
 
     def fake_datetime(self):
         class FakeDateTime(datetime.datetime):
@@ -385,15 +393,12 @@ class FakeTime:
 
         end_time = self._now + delay
         event = asyncio.Event()
-        entry = (end_time, event)
-        self._waiters.add(entry)
-        try:
-            await event.wait()
-        finally:
-            self._waiters.remove(entry)
+        # the counter breaks ties, so events are never compared
+        heapq.heappush(self._waiters, (end_time, next(self._counter), event))
+        await event.wait()
 
     def add_time(self, time):
         self._now += time
-        for end_time, event in self._waiters:
-            if end_time >= self._now:
-                event.set()
+        while self._waiters and self._waiters[0][0] <= self._now:
+            _, _, event = heapq.heappop(self._waiters)
+            event.set()
@@ -2,16 +2,20 @@ import asyncio
 import contextlib
 import datetime
 import email
+import ipaddress
 import json
 import pathlib
 
 import h11
 import pytest
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import ec
 
 import not_my_board._http as http
 import not_my_board._util as util
 
-from .util import sh, sh_task, wait_for_ports
+from .util import sh_task, wait_for_ports
 
 project_dir = pathlib.Path(__file__).parents[1]
 
@@ -24,72 +28,153 @@ async def tinyproxy():
         yield "http://127.0.0.1:8888"
 
 
-async def test_proxy_connect(tinyproxy):
+@pytest.fixture(scope="module")
+async def hub():
     async with sh_task("not-my-board hub", "hub", wait_ready=True):
-        client = http.Client(proxies={"http": tinyproxy})
-        response = await client.get_json("http://127.0.0.1:2092/api/v1/places")
-        assert response == {"places": []}
-
-
-async def test_proxy_ignore():
-    async with sh_task("not-my-board hub", "hub", wait_ready=True):
-        client = http.Client(
-            proxies={"http": "http://non-existing.localhost", "no": "127.0.0.1"}
+        yield "http://127.0.0.1:2092"
+
+
+async def test_proxy_connect(tinyproxy, hub):
+    client = http.Client(proxies={"http": tinyproxy})
+    response = await client.get_json(f"{hub}/api/v1/places")
+    assert response == {"places": []}
+
+
+async def test_proxy_ignore(hub):
+    client = http.Client(
+        proxies={"http": "http://non-existing.localhost", "no": "127.0.0.1"}
+    )
+    response = await client.get_json(f"{hub}/api/v1/places")
+    assert response == {"places": []}
+
+
+def _generate_certs(root_cert_file, key_file, cert_file):
+    now = datetime.datetime.now(tz=datetime.timezone.utc)
+    not_after = now + datetime.timedelta(days=365000)
+
+    root_key = ec.generate_private_key(ec.SECP384R1())
+    root_name = x509.Name(
+        [x509.NameAttribute(x509.NameOID.COMMON_NAME, "not-my-board-root-ca")]
+    )
+    root_cert = (
+        x509.CertificateBuilder()
+        .subject_name(root_name)
+        .issuer_name(root_name)
+        .public_key(root_key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now)
+        .not_valid_after(not_after)
+        .add_extension(x509.BasicConstraints(ca=True, path_length=None), critical=True)
+        .add_extension(
+            x509.KeyUsage(
+                digital_signature=False,
+                content_commitment=False,
+                key_encipherment=False,
+                data_encipherment=False,
+                key_agreement=False,
+                key_cert_sign=True,
+                crl_sign=True,
+                encipher_only=False,
+                decipher_only=False,
+            ),
+            critical=True,
         )
-        response = await client.get_json("http://127.0.0.1:2092/api/v1/places")
-        assert response == {"places": []}
+        .add_extension(
+            x509.SubjectKeyIdentifier.from_public_key(root_key.public_key()),
+            critical=False,
+        )
+        .sign(root_key, hashes.SHA256())
+    )
+
+    hostname = "hub.local"
+    key = ec.generate_private_key(ec.SECP256R1())
+    cert = (
+        x509.CertificateBuilder()
+        .subject_name(
+            x509.Name([x509.NameAttribute(x509.NameOID.COMMON_NAME, hostname)])
+        )
+        .issuer_name(root_name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now)
+        .not_valid_after(not_after)
+        .add_extension(
+            x509.SubjectAlternativeName(
+                [
+                    x509.DNSName(hostname),
+                    x509.DNSName(f"*.{hostname}"),
+                    x509.IPAddress(ipaddress.ip_address("127.0.0.1")),
+                ]
+            ),
+            critical=False,
+        )
+        .add_extension(
+            x509.BasicConstraints(ca=False, path_length=None), critical=False
+        )
+        .add_extension(
+            x509.KeyUsage(
+                digital_signature=True,
+                content_commitment=False,
+                key_encipherment=True,
+                data_encipherment=False,
+                key_agreement=False,
+                key_cert_sign=False,
+                crl_sign=False,
+                encipher_only=False,
+                decipher_only=False,
+            ),
+            critical=False,
+        )
+        .add_extension(
+            x509.ExtendedKeyUsage([x509.ExtendedKeyUsageOID.SERVER_AUTH]),
+            critical=False,
+        )
+        .add_extension(
+            x509.AuthorityKeyIdentifier.from_issuer_public_key(root_key.public_key()),
+            critical=False,
+        )
+        .sign(root_key, hashes.SHA256())
+    )
+
+    root_cert_file.write_bytes(root_cert.public_bytes(serialization.Encoding.PEM))
+    cert_file.write_bytes(cert.public_bytes(serialization.Encoding.PEM))
+    key_file.write_bytes(
+        key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        )
+    )
 
 
-async def test_proxy_connect_https(tinyproxy):
-    root_key = project_dir / "tests/.cache/not-my-board-root-ca.key"
-    root_cert = project_dir / "tests/.cache/not-my-board-root-ca.crt"
-    key_file = project_dir / "tests/.cache/not-my-board.key"
-    cert_file = project_dir / "tests/.cache/not-my-board.crt"
+@pytest.fixture(scope="session")
+def tls_certs():
+    cache_dir = project_dir / "tests/.cache"
+    root_cert = cache_dir / "not-my-board-root-ca.crt"
+    key_file = cache_dir / "not-my-board.key"
+    cert_file = cache_dir / "not-my-board.crt"
     if not key_file.exists():
-        key_file.parent.mkdir(exist_ok=True)
-        await sh(
-            "openssl req "
-            "-x509 "
-            "-newkey ec "
-            "-pkeyopt ec_paramgen_curve:secp384r1 "
-            "-days 365000 "
-            "-nodes "
-            f"-keyout {root_key} "
-            f"-out {root_cert} "
-            "-subj '/CN=not-my-board-root-ca'"
-        )
-        hostname = "hub.local"
-        await sh(
-            "openssl req "
-            "-x509 "
-            f"-CA {root_cert} "
-            f"-CAkey {root_key} "
-            "-newkey ec "
-            "-pkeyopt ec_paramgen_curve:prime256v1 "
-            "-days 365000 "
-            "-nodes "
-            f"-keyout {key_file} "
-            f"-out {cert_file} "
-            f"-subj '/CN={hostname}' "
-            f"-addext 'subjectAltName=DNS:{hostname},DNS:*.{hostname},IP:127.0.0.1' "
-            "-addext 'basicConstraints=CA:FALSE' "
-            "-addext 'keyUsage=digitalSignature,keyEncipherment' "
-            "-addext 'extendedKeyUsage=serverAuth'"
-        )
+        cache_dir.mkdir(exist_ok=True)
+        _generate_certs(root_cert, key_file, cert_file)
+    return root_cert, key_file, cert_file
+
 
+async def test_proxy_connect_https(tinyproxy, tls_certs):
+    root_cert, key_file, cert_file = tls_certs
     async with sh_task(
         (
-            "uvicorn --port 2092 "
+            # the module-scoped hub fixture occupies 2092
+            "uvicorn --port 2093 "
             f"--ssl-keyfile {key_file} "
             f"--ssl-certfile {cert_file} "
             "not_my_board:asgi_app"
         ),
         "hub",
     ):
-        await wait_for_ports(2092)
+        await wait_for_ports(2093)
 
         client = http.Client(ca_files=[root_cert], proxies={"https": tinyproxy})
-        response = await client.get_json("https://127.0.0.1:2092/api/v1/places")
+        response = await client.get_json("https://127.0.0.1:2093/api/v1/places")
         assert response == {"places": []}
 
 
@@ -148,6 +233,8 @@ async def test_proxy_connect_https(tinyproxy):
         ("anotherdomain.com", "*, anotherdomain.com", True),
         ("newdomain.com", "*, anotherdomain.com", False),
         ("localhost\n", "localhost, anotherdomain.com", False),
+        # tail match ignores case of the pattern, too
+        ("www.example.com", "localhost,.EXAMPLE.com", True),
     ],
 )
 def test_is_proxy_disabled(host, no_proxy_env, expected):
@@ -71,6 +71,9 @@ async def register_exporter(hub, ip=DEFAULT_EXPORTER_IP):
 
 
 async def test_register_exporter(hub):
+    places = await hub.get_places()
+    assert len(places["places"]) == 0
+
     async with register_exporter(hub):
         places = await hub.get_places()
         assert len(places["places"]) == 1
@@ -88,6 +91,20 @@ async def register_agent(hub, ip=DEFAULT_AGENT_IP):
             yield rpc1
 
 
+async def wait_until_queued(hub):
+    """Wait until a reserve request is in the hub's wait queue.
+
+    The hub has no observable event for a queued request, so this peeks at
+    the private ``Hub._wait_queue``. If that attribute is renamed or
+    restructured, update this helper, otherwise the callers fail with a
+    timeout after 2 seconds.
+    """
+
+    async with util.timeout(2):
+        while not hub._wait_queue:  # noqa: ASYNC110
+            await asyncio.sleep(0)
+
+
 async def test_reserve_place(hub):
     async with register_exporter(hub) as (exporter, _):
         async with register_agent(hub) as agent:
@@ -116,7 +133,7 @@ async def test_reserve_queue(hub):
             # try to reserve same place again
             coro = agent.reserve(candidate_ids)
             async with util.background_task(coro) as reserve_task:
-                await asyncio.sleep(0.001)
+                await wait_until_queued(hub)
                 # request should be in queue now
                 assert not reserve_task.done()
 
@@ -136,13 +153,13 @@ async def test_all_places_disappear_while_trying_to_reserve(hub):
             with pytest.raises(jsonrpc.RemoteError) as execinfo:
                 # try to reserve same place again
                 coro = agent.reserve(candidate_ids)
-                async with util.background_task(coro):
-                    await asyncio.sleep(0.001)
+                async with util.background_task(coro) as reserve_task:
+                    await wait_until_queued(hub)
                     # request should be in queue now
 
                     # when the exporter disappears ...
                     await util.cancel_tasks([exporter_task])
-                    await asyncio.sleep(0.5)
+                    await asyncio.wait([reserve_task])
             # ... then the queued reservation is canceled
             assert "All candidate places are gone" in str(execinfo.value)
 
@@ -160,7 +177,7 @@ async def test_one_place_disappears_while_trying_to_reserve(hub):
                 # try to reserve both places again
                 coro = agent.reserve(candidate_ids)
                 async with util.background_task(coro) as reserve_task:
-                    await asyncio.sleep(0.001)
+                    await wait_until_queued(hub)
                     # request should be in queue now
                     assert not reserve_task.done()
 
@@ -183,7 +200,7 @@ async def test_return_non_candidate(hub):
                 # try to reserve place #1 again
                 coro = agent.reserve(candidate_ids[:1])
                 async with util.background_task(coro) as reserve_task:
-                    await asyncio.sleep(0.001)
+                    await wait_until_queued(hub)
                     # request should be in queue now
 
                     # when place #2 is returned ...
@@ -52,9 +52,7 @@ class FakeTransport:
 
     async def receive_from_test(self):
         while True:
-            data = await self.send_queue.get()
-            yield data
-            self.send_queue.task_done()
+            yield await self.send_queue.get()
 
     async def send_to_jsonrpc(self, **data):
         data["jsonrpc"] = "2.0"
@@ -63,7 +61,6 @@ class FakeTransport:
 
     async def receive_from_jsonrpc(self):
         raw = await self.receive_queue.get()
-        self.receive_queue.task_done()
         return json.loads(raw)
 
     def is_empty(self):
@@ -232,7 +229,7 @@ async def test_send_notification(fakes):
 
 async def test_receive_error(fakes):
     with pytest.raises(jsonrpc.RemoteError) as execinfo:
-        async with util.background_task(fakes.channel.some_func()):
+        async with util.background_task(fakes.channel.some_func()) as call:
             message = await fakes.transport.receive_from_jsonrpc()
 
             # send error response
@@ -251,7 +248,7 @@ async def test_receive_error(fakes):
                     },
                 },
             )
-            await asyncio.sleep(0.5)
+            await asyncio.wait([call])
 
     # call should raise RemoteError
     assert "fake error" in str(execinfo.value)
@@ -314,7 +311,7 @@ async def test_prevent_hidden_function_call(fakes):
 
 async def test_fail_call_on_parse_error(fakes):
     with pytest.raises(jsonrpc.ProtocolError) as execinfo:
-        async with util.background_task(fakes.channel.some_func()):
+        async with util.background_task(fakes.channel.some_func()) as call:
             # check sent request
             message = await fakes.transport.receive_from_jsonrpc()
 
@@ -323,7 +320,7 @@ async def test_fail_call_on_parse_error(fakes):
                 id=message["id"], error={"code": "not int"}
             )
 
-            await asyncio.sleep(0.5)
+            await asyncio.wait([call])
 
     # call with matching ID should still fail
     assert '"error.code" must be an integer' in str(execinfo.value)
@@ -387,11 +384,11 @@ async def test_pending_call_is_canceled_on_shutdown():
     async with util.background_task(channel.communicate_forever()) as com_task:
 
         with pytest.raises(RuntimeError) as execinfo:
-            async with util.background_task(channel.some_func()):
+            async with util.background_task(channel.some_func()) as call:
                 # wait for sent message
                 await transport.receive_from_jsonrpc()
                 await util.cancel_tasks([com_task])
-                await asyncio.sleep(0.5)
+                await asyncio.wait([call])
 
         assert "Connection closed" in str(execinfo.value)
 
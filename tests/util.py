@@ -126,11 +126,14 @@ async def sh_poll(cmd, timeout=None):  # noqa: ASYNC109
         interval = 1
 
     async def poll_loop():
+        # start polling fast and back off up to the interval
+        delay = min(0.025, interval)
         while True:
             result = await sh(cmd, check=False)
             if result.returncode == 0:
                 break
-            await asyncio.sleep(interval)
+            await asyncio.sleep(delay)
+            delay = min(delay * 1.5, interval)
 
     await asyncio.wait_for(poll_loop(), timeout)
 
@@ -148,14 +151,21 @@ async def _log_output(stream, cmd, prefix):
 
 async def wait_for_ports(*ports, timeout=7):  # noqa: ASYNC109
     async with util.timeout(timeout):
-        while True:
-            try:
-                for port in ports:
-                    async with util.connect("localhost", port):
-                        pass
-            except (ConnectionRefusedError, OSError):
-                await asyncio.sleep(0.1)
-                continue
+        await util.run_concurrently(*(_wait_for_port(port) for port in ports))
+
+
+async def _wait_for_port(port):
+    # most servers are up within a few milliseconds, so start polling fast and
+    # back off exponentially
+    delay = 0.001
+    while True:
+        try:
+            async with util.connect("localhost", port):
+                pass
+        except (ConnectionRefusedError, OSError):
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 0.1)
+        else:
             break
 
 
@@ -165,9 +175,7 @@ def fake_rpc_pair():
 
     async def receive_iter(queue):
         while True:
-            data = await queue.get()
-            yield data
-            queue.task_done()
+            yield await queue.get()
 
     rpc1 = jsonrpc.Channel(rpc1_to_rpc2.put, receive_iter(rpc2_to_rpc1))
     rpc2 = jsonrpc.Channel(rpc2_to_rpc1.put, receive_iter(rpc1_to_rpc2))